@@ -1,75 +1,46 @@
 import streamlit as st
 import time
 import os
-import base64
 from src.backend import (
     generate_next_question, 
     is_skill_vague, 
     get_clarification_question, 
     generate_roadmap, 
     generate_user_profile_summary,
-    wrap_html
+    wrap_html,
+    router,
+    FIELD_LABELS,
+    split_roadmap_sections,
+    regenerate_roadmap_sections,
+    update_profile_summary,
+    parse_html_blocks
 )
+from src.session_store import ChatMessage, CompressedText, SessionStore, session_memory_report
+from src.render import (
+    SIDEBAR_CSS,
+    LANDING_BUTTON_CSS,
+    DOWNLOAD_BUTTON_CSS,
+    image_src,
+    get_meter,
+    render_html,
+    render_markdown,
+    metered_fragment,
+    activate_session_ledger,
+    rerun
+)
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from reportlab.platypus import Table, TableStyle
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListItem, ListFlowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib import colors
-import re
 import io
 
-# ---------------- IMAGE ENCODING ----------------
-def get_base64_image(image_path):
-    with open(image_path, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
-
-try:
-    hero_img_base64 = get_base64_image(os.path.join("static", "image.png"))
-except Exception:
-    hero_img_base64 = "" # Fallback if image missing
-
 st.set_page_config(page_title="RAAH AI - Your Career Roadmap", layout="wide")
+get_meter().start("app")
 # ---------------- SIDEBAR STYLING ----------------
-st.markdown("""
-<style>
-/* Sidebar background (optional, light gray to not clash) */
-[data-testid="stSidebar"] {
-    background-color: #1e1e1e;
-}
-
-/* Sidebar title "RAAH AI 🚀" color */
-[data-testid="stSidebar"] .css-1d391kg h1,
-[data-testid="stSidebar"] .css-1d391kg h2 {
-    background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-}
-
-/* "Your Progress" labels color */
-[data-testid="stSidebar"] .css-1d391kg p,
-[data-testid="stSidebar"] .css-1d391kg span {
-    color: #00FFFF;
-}
-
-/* Reset button color persistent */
-[data-testid="stSidebar"] div.stButton > button {
-    background-color: transparent !important;
-    border: 2px solid #4B0082 !important;
-    color: #00FFFF !important;
-    padding: 10px 20px !important;
-    font-weight: bold !important;
-    border-radius: 10px !important;
-    transition: 0.3s !important;
-}
-
-[data-testid="stSidebar"] div.stButton > button:hover {
-    transform: scale(1.03);
-    border-color: #00FFFF !important;
-}
-</style>
-""", unsafe_allow_html=True)
+render_html(SIDEBAR_CSS)
 # ---------------- SESSION STATE INITIALIZATION ----------------
 if "started" not in st.session_state:
     st.session_state.started = False
@@ -83,33 +54,72 @@ if "finalized" not in st.session_state:
     st.session_state.finalized = False
 if "clarification_count" not in st.session_state:
     st.session_state.clarification_count = 0
-if "roadmap_text" not in st.session_state:
-    st.session_state.roadmap_text = ""
+if "roadmap_html" not in st.session_state:
+    st.session_state.roadmap_html = CompressedText() # Whole roadmap, compressed as one blob
+if "roadmap_index" not in st.session_state:
+    st.session_state.roadmap_index = [] # [(title, start, end)] offsets of each <h2> section
 if "profile_summary" not in st.session_state:
-    st.session_state.profile_summary = ""
+    st.session_state.profile_summary = CompressedText()
+if "pdf_digest" not in st.session_state:
+    st.session_state.pdf_digest = None
 if "awaiting_confirmation" not in st.session_state:
     st.session_state.awaiting_confirmation = False
+# Backend calls made during this rerun report their token usage to this session's ledger
+# (fragment-only reruns activate it again in metered_fragment)
+activate_session_ledger()
+# ---------------- SESSION MEMORY ----------------
+@st.cache_resource
+def get_session_store():
+    """One shared store per server process for large per-session artifacts."""
+    return SessionStore()
+
+def get_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+session_store = get_session_store()
+session_id = get_session_id()
+memory_report = session_memory_report(
+    st.session_state, session_store.artifact_bytes(session_id)
+)
+session_store.touch(session_id, memory_report["after"])
+
 # ---------------- RESET APP ----------------
 def reset_app():
+    session_store.drop_session(session_id)
     for key in list(st.session_state.keys()):
         del st.session_state[key]
-    st.rerun()
+    rerun()
 
 # ---------------- UI HELPERS ----------------
 def add_message(role, content):
-    st.session_state.chat_history.append({"role": role, "content": content})
+    st.session_state.chat_history.append(ChatMessage(role, content))
+
+def set_roadmap_sections(sections):
+    # Sections are mostly under the compression threshold on their own, so the
+    # roadmap is compressed whole and sections are kept as offsets into it
+    index, offset = [], 0
+    for title, section_html in sections:
+        index.append((title, offset, offset + len(section_html)))
+        offset += len(section_html)
+    st.session_state.roadmap_html = CompressedText("".join(section_html for _, section_html in sections))
+    st.session_state.roadmap_index = index
+
+def get_roadmap_sections():
+    roadmap_html = st.session_state.roadmap_html.text
+    return [(title, roadmap_html[start:end]) for title, start, end in st.session_state.roadmap_index]
 
 def stream_text(text, placeholder):
     """Simulates a typing animation by updating the placeholder word by word."""
     full_text = ""
     for word in text.split():
         full_text += word + " "
-        placeholder.markdown(full_text + "▌")
+        render_markdown(full_text + "▌", placeholder)
         time.sleep(0.04)  # Adjust speed here
-    placeholder.markdown(full_text)
+    render_markdown(full_text, placeholder)
 
-def create_pdf_reportlab(summary_html, roadmap_html):
-    """Generates a PDF from the HTML content using ReportLab."""
+def create_pdf_reportlab(summary_html, roadmap_sections):
+    """Generates a PDF from the profile summary and the roadmap's section HTML using ReportLab."""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -152,33 +162,11 @@ def create_pdf_reportlab(summary_html, roadmap_html):
     elements.append(Paragraph("RAAH AI Career Roadmap", title_style))
     elements.append(Spacer(1, 20))
 
-    SECTION_TITLES = [
-        "Executive Summary",
-        "Learning Phases",
-        "Weekly Breakdown",
-        "Recommended Resources",
-        "Tips and Notes"
-    ]
-
-    from reportlab.platypus import Table, TableStyle
-
     def html_to_flowables(html_text):
         flowables = []
-
-        # ---------- TABLE HANDLING ----------
-        tables = re.findall(r"<table.*?>.*?</table>", html_text, re.DOTALL)
-
-        for table_html in tables:
-            rows = re.findall(r"<tr>(.*?)</tr>", table_html, re.DOTALL)
-            table_data = []
-
-            for row in rows:
-                cells = re.findall(r"<t[hd]>(.*?)</t[hd]>", row, re.DOTALL)
-                clean_cells = [re.sub(r'<.*?>', '', cell).strip() for cell in cells]
-                table_data.append(clean_cells)
-
-            if table_data:
-                rl_table = Table(table_data, hAlign='LEFT')
+        for kind, payload in parse_html_blocks(html_text):
+            if kind == "table":
+                rl_table = Table([list(row) for row in payload], hAlign='LEFT')
 
                 rl_table.setStyle(TableStyle([
                     ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#4A90E2")),
@@ -194,55 +182,15 @@ def create_pdf_reportlab(summary_html, roadmap_html):
 
                 flowables.append(rl_table)
                 flowables.append(Spacer(1, 15))
-
-        # Remove tables from text so they don't render twice
-        html_text = re.sub(r"<table.*?>.*?</table>", "", html_text, flags=re.DOTALL)
-
-        # ---------- NORMAL BLOCK PROCESSING ----------
-        blocks = re.split(
-            r'(<h2.*?>|</h2>|<h3.*?>|</h3>|<p.*?>|</p>|<ul.*?>|</ul>|<li>|</li>)',
-            html_text
-        )
-
-        in_list = False
-        list_items = []
-
-        for block in blocks:
-            clean_block = re.sub(r'<.*?>', '', block).strip()
-            if not clean_block:
-                continue
-
-            # Force Section Titles Blue
-            if any(clean_block.startswith(title) for title in SECTION_TITLES):
-                flowables.append(Paragraph(clean_block, section_style))
-                continue
-
-            # Handle Lists
-            if "<ul>" in block:
-                in_list = True
-                list_items = []
-                continue
-
-            if "</ul>" in block:
-                if list_items:
-                    flowables.append(ListFlowable(list_items, bulletType='bullet'))
-                in_list = False
-                continue
-
-            if "<li>" in block:
-                continue
-
-            if "</li>" in block:
-                if in_list:
-                    list_items.append(ListItem(Paragraph(clean_block, body_style)))
-                continue
-
-            # Everything else normal paragraph
-            if in_list:
-                list_items.append(ListItem(Paragraph(clean_block, body_style)))
+            elif kind == "section":
+                flowables.append(Paragraph(payload, section_style))
+            elif kind == "list":
+                flowables.append(ListFlowable(
+                    [ListItem(Paragraph(item, body_style)) for item in payload],
+                    bulletType='bullet'
+                ))
             else:
-                flowables.append(Paragraph(clean_block, body_style))
-
+                flowables.append(Paragraph(payload, body_style))
         return flowables
 
     # ---- User Profile Summary ----
@@ -251,7 +199,8 @@ def create_pdf_reportlab(summary_html, roadmap_html):
     elements.append(Spacer(1, 20))
 
     # ---- Roadmap ----
-    elements.extend(html_to_flowables(roadmap_html))
+    for section_html in roadmap_sections:
+        elements.extend(html_to_flowables(section_html))
 
     # ---- Footer ----
     elements.append(Spacer(1, 40))
@@ -274,8 +223,9 @@ def create_pdf_reportlab(summary_html, roadmap_html):
     return buffer.getvalue()
 
 # ---------------- SIDEBAR ----------------
-with st.sidebar:
-    st.markdown(f"""
+@metered_fragment("sidebar")
+def sidebar_panel():
+    render_html(f"""
     <div style="
         font-size:2rem;
         font-weight:800;
@@ -285,10 +235,10 @@ with st.sidebar:
     ">
         RAAH AI
     </div>
-    """, unsafe_allow_html=True)
+    """)
     st.markdown("---")
     if st.session_state.user_context:
-        st.markdown(f"""
+        render_html(f"""
         <div style="
             font-size:1.25rem;
             font-weight:700;
@@ -299,12 +249,12 @@ with st.sidebar:
         ">
             Your Progress
         </div>
-        """, unsafe_allow_html=True)
+        """)
         for k, v in st.session_state.user_context.items():
             label = k.replace('_', ' ').capitalize()
             # Truncate long values
             display_val = (v[:30] + '...') if len(str(v)) > 30 else v
-            st.write(f"**{label}:** {display_val}")
+            render_markdown(f"**{label}:** {display_val}")
     else:
         st.info("Start the conversation to see your progress here!")
     
@@ -312,174 +262,107 @@ with st.sidebar:
     if st.button("Reset Session", use_container_width=True):
         reset_app()
 
-# ---------------- LANDING PAGE ----------------
-if not st.session_state.started:
-    # Custom CSS for the button
-    st.markdown("""
-    <style>
-        div.stButton > button {
-            background-color: transparent !important;
-            border: 2px solid #4B0082 !important;
-            color: #00FFFF !important;
-            padding: 12px 35px !important;
-            font-weight: bold !important;
-            font-size: 1.1rem !important;
-            border-radius: 10px !important;
-            transition: 0.3s !important;
-            margin-top: 20px !important;
-        }
-        div.stButton > button:hover {
-            transform: scale(1.03);
-            border-color: #00FFFF !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    logo_path = os.path.join("static", "images.png")
-    if not st.session_state.started:
-        if os.path.exists(logo_path):
-            with open(logo_path, "rb") as f:
-                img_bytes = f.read()
-            encoded_logo = base64.b64encode(img_bytes).decode()
-        else:
-            encoded_logo = None
-    # Hero Section (StudyMate-style, only landing page)
-    st.markdown(f"""
-    <div style="display:flex; align-items:center; justify-content:space-between; margin-bottom:20px;">
-        <div>
-            <div style="
-                font-size:5rem;
-                font-weight:800;
-                background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            ">
-                RAAH AI
-            </div>
-            <div style="font-size:1.2rem; color:#636e72; margin-top:5px;">
-                Navigate your career path with AI-driven clarity. Build a personalized learning roadmap tailored to your goals, budget, and schedule.            
-            </div>
-        </div>
-        <div>
-            {f'<img src="data:image/jpg;base64,{encoded_logo}" style="width:500px;" />' if encoded_logo else '<div style="width:150px;height:150px;background:#ddd;"></div>'}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Functional button placed below the left text area via flow
-    if st.button("Get Started →"):
-        st.session_state.started = True
-        with st.spinner("RAAH AI is waking up... ⏳"):
-            field, question = generate_next_question([], {})
-            st.session_state.current_field = field
-            st.session_state.pending_stream = question
-        st.rerun()
-
-# ---------------- ROADMAP PAGE ----------------
-elif st.session_state.finalized:
-    st.markdown(f"""
-<div style="display:flex; align-items:center; justify-content:flex-start; margin-bottom:20px;">
-    <div>
-        <div style="
-            font-size:5rem;
-            font-weight:800;
-            background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        ">
-            Your Personalized Roadmap 🗺️
-        </div>
-        <div style="font-size:1.2rem; color:#636e72; margin-top:5px;">
-            Here’s your tailored learning path, crafted by RAAH AI just for you.            
-        </div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
-    st.markdown("---")
-    
-    # Display AI-generated Summary in HTML
-    st.markdown(f"""
-<div style="
-    padding:20px;
-    border-radius:12px;
-    background: linear-gradient(135deg, #004d4d, #008080);
-    border-left: 5px solid #00FFFF;
-    font-family: Time New Roman, sans-serif;
-    color: #e0f7fa;  /* light text to contrast dark bg */
-    font-size:1rem;
-">
-    <strong>👤 Your Profile Summary</strong><br><br>
-    {st.session_state.profile_summary}
-</div>
-""", unsafe_allow_html=True)
-    st.markdown("---")
-    # Display Roadmap in HTML
-    st.markdown(f"""
-<div style="
-    padding:20px;
-    border-radius:12px;
-    background: linear-gradient(135deg, #004d4d, #008080);
-    border-left: 5px solid #00FFFF;
-    font-family: 'Times New Roman', sans-serif;
-    color: #e0f7fa;
-    font-size:1rem;
-">
-    {st.session_state.roadmap_text}
-</div>
-""", unsafe_allow_html=True)
-    
-    st.markdown("---")
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        # PDF Export using ReportLab (Pure Python, Cloud Compatible)
-        with st.spinner("Generating PDF..."):
-            try:
-                pdf_bytes = create_pdf_reportlab(st.session_state.profile_summary, st.session_state.roadmap_text)
-                st.markdown(f"""
-<style>
-.download-btn {{
-    background-color: transparent !important;
-    border: 2px solid #4B0082 !important;
-    color: #00FFFF !important;
-    padding: 12px 35px !important;
-    font-weight: bold !important;
-    font-size: 1.1rem !important;
-    border-radius: 10px !important;
-    transition: 0.3s !important;
-}}
-.download-btn:hover {{
-    transform: scale(1.03);
-    border-color: #00FFFF !important;
-}}
-</style>
-<a href="data:application/pdf;base64,{base64.b64encode(pdf_bytes).decode()}" download="raaahi_roadmap.pdf" class="download-btn">Download Roadmap as PDF 📄</a>
-""", unsafe_allow_html=True)
-            except Exception as e:
-                st.error(f"Error generating PDF: {e}")
-                st.info("Ensure the reportlab library is installed.")
-
-
-# ---------------- CHAT PAGE ----------------
-# ---------------- CHAT PAGE ----------------
-else:
-    # Gradient header
-    st.markdown("""
-    <div style="
-        font-size:3rem;
-        font-weight:800;
-        background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom:20px;
-    ">
-        RAAH AI Chat 💬
-    </div>
-    """, unsafe_allow_html=True)
-    
+    if os.getenv("RAAH_DEBUG_METRICS"):
+        with st.expander("Session memory"):
+            st.write(f"**This session:** {memory_report['before']:,} B before → {memory_report['after']:,} B after")
+            st.write(f"**All sessions:** {len(session_store.usage())} live, {session_store.total_bytes():,} B")
+        with st.expander("Token usage"):
+            totals = st.session_state.token_ledger.totals()
+            st.write(f"**Session:** {totals['calls']} calls, {totals['prompt_tokens']:,} prompt + "
+                     f"{totals['completion_tokens']:,} completion tokens ({totals['cached_tokens']:,} cached)")
+            for task, task_stats in st.session_state.token_ledger.tasks.items():
+                sections = ", ".join(f"{name} {tokens:,}" for name, tokens in task_stats["sections"].items())
+                st.write(f"**{task}:** {task_stats['prompt_tokens']:,} / {task_stats['completion_tokens']:,} ({sections})")
+        with st.expander("Model routing"):
+            for task, task_models in router.stats().items():
+                for model, model_stats in task_models.items():
+                    st.write(f"**{task} / {model}:** {model_stats['calls']} calls, "
+                             f"{model_stats['avg_latency']}s avg, {model_stats['error_rate']:.0%} errors")
+        with st.expander("Reruns"):
+            # Most recent first; the run in progress isn't listed until it finishes
+            for run in reversed(get_meter().runs):
+                st.write(f"**{run['scope']}:** {run['html_bytes']:,} B of HTML/markdown, {run['ms']} ms")
+
+# ---------------- ROADMAP PAGE PANELS ----------------
+@metered_fragment("pdf")
+def pdf_panel():
+    # PDF Export using ReportLab (Pure Python, Cloud Compatible)
+    with st.spinner("Generating PDF..."):
+        try:
+            # The PDF lives once in the shared store; the session only keeps its digest.
+            # It is rebuilt only if the reaper evicted it.
+            pdf_bytes = session_store.get_artifact(session_id, "roadmap_pdf", st.session_state.pdf_digest)
+            if pdf_bytes is None:
+                pdf_bytes = create_pdf_reportlab(
+                    st.session_state.profile_summary.text,
+                    [section_html for _, section_html in get_roadmap_sections()]
+                )
+                st.session_state.pdf_digest = session_store.put_artifact(session_id, "roadmap_pdf", pdf_bytes)
+            render_html(DOWNLOAD_BUTTON_CSS)
+            # Served by URL from Streamlit's media store instead of an inline base64 link
+            st.download_button(
+                "Download Roadmap as PDF 📄",
+                data=pdf_bytes,
+                file_name="raaahi_roadmap.pdf",
+                mime="application/pdf"
+            )
+        except Exception as e:
+            st.error(f"Error generating PDF: {e}")
+            st.info("Ensure the reportlab library is installed.")
+
+@metered_fragment("edit")
+def edit_panel():
+    # Change a single detail and regenerate only the sections that depend on it.
+    # As a fragment, picking a field or typing only reruns this panel, not the roadmap above.
+    if "edit_notice" in st.session_state:
+        st.toast(st.session_state.pop("edit_notice"))
+    with st.expander("✏️ Update a detail"):
+        edit_field = st.selectbox(
+            "Detail to change",
+            list(st.session_state.user_context.keys()),
+            format_func=lambda f: FIELD_LABELS.get(f, f)
+        )
+        new_value = st.text_input(
+            "New value",
+            value=st.session_state.user_context.get(edit_field, ""),
+            key=f"edit_value_{edit_field}"
+        )
+        if st.button("Update Roadmap", use_container_width=True):
+            new_value = new_value.strip()
+            if new_value and new_value != st.session_state.user_context.get(edit_field):
+                # Regenerate from a copy so a failed LLM call leaves the saved profile untouched
+                user_context = {**st.session_state.user_context, edit_field: new_value}
+                try:
+                    with st.spinner("Updating the affected sections... ⏳"):
+                        sections, changed = regenerate_roadmap_sections(
+                            user_context,
+                            get_roadmap_sections(),
+                            edit_field
+                        )
+                        profile_summary = update_profile_summary(
+                            st.session_state.profile_summary.text,
+                            user_context,
+                            edit_field
+                        )
+                except Exception as e:
+                    st.error(f"Couldn't update your roadmap: {e}")
+                    return
+                st.session_state.user_context = user_context
+                set_roadmap_sections(sections)
+                st.session_state.profile_summary = CompressedText(profile_summary)
+                st.session_state.pdf_digest = None
+                st.session_state.edit_notice = f"Updated: {', '.join(changed) or 'no sections'}"
+                # The roadmap, summary and sidebar progress all changed
+                rerun()
+
+# ---------------- CHAT PAGE PANEL ----------------
+@metered_fragment("chat")
+def chat_panel():
     # Display chat history with emoji avatars
     for msg in st.session_state.chat_history:
         emoji = "🤖" if msg["role"] == "assistant" else "🧑"
         with st.chat_message(msg["role"], avatar=emoji):
-            st.markdown(msg["content"])
+            render_markdown(msg["content"])
 
     # Handle streamed response if pending
     if "pending_stream" in st.session_state:
@@ -489,12 +372,13 @@ else:
             stream_text(question, placeholder)
         add_message("assistant", question)
 
-    # Chat input with emoji avatar
+    # Chat input with emoji avatar. Submitting runs just this fragment; a clarification
+    # reply stays fragment-scoped, while a saved answer ends in a full rerun (sidebar progress)
     user_input = st.chat_input("Share your details here...")
     
     if user_input:
         with st.chat_message("user", avatar="🧑‍💻"):
-            st.markdown(user_input)
+            render_markdown(user_input)
         add_message("user", user_input)
         
         with st.spinner("RAAH AI is thinking... ⏳"):
@@ -506,7 +390,8 @@ else:
                     st.session_state.clarification_count += 1
                     clarification_q = get_clarification_question(user_input)
                     st.session_state.pending_stream = clarification_q
-                    st.rerun()
+                    # Nothing outside the chat changed
+                    rerun("fragment")
             
             # --- REGULAR FIELD COLLECTION ---
             st.session_state.user_context[current_field] = user_input
@@ -541,11 +426,143 @@ else:
                 
                 # Generate Profile Summary and Roadmap
                 with st.spinner("Building your personalized experience..."):
-                    st.session_state.profile_summary = generate_user_profile_summary(st.session_state.user_context)
-                    st.session_state.roadmap_text = generate_roadmap(st.session_state.user_context)
+                    st.session_state.profile_summary = CompressedText(
+                        generate_user_profile_summary(st.session_state.user_context)
+                    )
+                    set_roadmap_sections(
+                        split_roadmap_sections(generate_roadmap(st.session_state.user_context))
+                    )
+                    st.session_state.pdf_digest = None
                     st.session_state.finalized = True
                 
                 progress_placeholder.empty()
                 status_placeholder.empty()
         
-        st.rerun()
+        # A new field was saved, so the sidebar progress needs the full page
+        rerun()
+
+# Close this run's meter record even if the page raises or calls st.stop(); otherwise
+# the next fragment-only rerun would see it still open and be counted into it
+try:
+    with st.sidebar:
+        sidebar_panel()
+
+    # ---------------- LANDING PAGE ----------------
+    if not st.session_state.started:
+        # Custom CSS for the button
+        render_html(LANDING_BUTTON_CSS)
+        # Served by URL (cached once per process) instead of re-encoding the logo every rerun
+        logo_src = image_src("images.png")
+        # Hero Section (StudyMate-style, only landing page)
+        render_html(f"""
+        <div style="display:flex; align-items:center; justify-content:space-between; margin-bottom:20px;">
+            <div>
+                <div style="
+                    font-size:5rem;
+                    font-weight:800;
+                    background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
+                    -webkit-background-clip: text;
+                    -webkit-text-fill-color: transparent;
+                ">
+                    RAAH AI
+                </div>
+                <div style="font-size:1.2rem; color:#636e72; margin-top:5px;">
+                    Navigate your career path with AI-driven clarity. Build a personalized learning roadmap tailored to your goals, budget, and schedule.            
+                </div>
+            </div>
+            <div>
+                {f'<img src="{logo_src}" style="width:500px;" />' if logo_src else '<div style="width:150px;height:150px;background:#ddd;"></div>'}
+            </div>
+        </div>
+        """)
+    
+        # Functional button placed below the left text area via flow
+        if st.button("Get Started →"):
+            st.session_state.started = True
+            with st.spinner("RAAH AI is waking up... ⏳"):
+                field, question = generate_next_question([], {})
+                st.session_state.current_field = field
+                st.session_state.pending_stream = question
+            rerun()
+
+    # ---------------- ROADMAP PAGE ----------------
+    elif st.session_state.finalized:
+        render_html(f"""
+    <div style="display:flex; align-items:center; justify-content:flex-start; margin-bottom:20px;">
+        <div>
+            <div style="
+                font-size:5rem;
+                font-weight:800;
+                background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
+                -webkit-background-clip: text;
+                -webkit-text-fill-color: transparent;
+            ">
+                Your Personalized Roadmap 🗺️
+            </div>
+            <div style="font-size:1.2rem; color:#636e72; margin-top:5px;">
+                Here’s your tailored learning path, crafted by RAAH AI just for you.            
+            </div>
+        </div>
+    </div>
+    """)
+        st.markdown("---")
+    
+        # Display AI-generated Summary in HTML
+        render_html(f"""
+    <div style="
+        padding:20px;
+        border-radius:12px;
+        background: linear-gradient(135deg, #004d4d, #008080);
+        border-left: 5px solid #00FFFF;
+        font-family: Time New Roman, sans-serif;
+        color: #e0f7fa;  /* light text to contrast dark bg */
+        font-size:1rem;
+    ">
+        <strong>👤 Your Profile Summary</strong><br><br>
+        {st.session_state.profile_summary.text}
+    </div>
+    """)
+        st.markdown("---")
+        # Display Roadmap in HTML, one block per section so edits only replace what changed
+        for _, section_html in get_roadmap_sections():
+            render_html(f"""
+    <div style="
+        padding:20px;
+        margin-bottom:10px;
+        border-radius:12px;
+        background: linear-gradient(135deg, #004d4d, #008080);
+        border-left: 5px solid #00FFFF;
+        font-family: 'Times New Roman', sans-serif;
+        color: #e0f7fa;
+        font-size:1rem;
+    ">
+        {section_html}
+    </div>
+    """)
+    
+        st.markdown("---")
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            pdf_panel()
+        with col2:
+            edit_panel()
+
+
+    # ---------------- CHAT PAGE ----------------
+    else:
+        # Gradient header
+        render_html("""
+        <div style="
+            font-size:3rem;
+            font-weight:800;
+            background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom:20px;
+        ">
+            RAAH AI Chat 💬
+        </div>
+        """)
+        chat_panel()
+finally:
+    get_meter().finish()
@@ -3,28 +3,42 @@ import os
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
 import re
+import html
+import functools
+from model_router import ModelRouter
+from llm_cassette import cassette_client_factory
+from prompt_builder import Prompt, serialize_context, record_usage
 
 load_dotenv()
 
 # Initialize LLMs
-llm_chat = ChatGroq(
-    model="llama-3.3-70b-versatile", # High quality for chat
-    temperature=0.7,
-    groq_api_key=os.getenv("GROQ_API_KEY")
-)
+def create_groq_client(model, profile):
+    """Builds the ChatGroq client the router uses for a model/task pair."""
+    return ChatGroq(
+        model=model,
+        temperature=profile.temperature,
+        timeout=profile.timeout,
+        max_retries=0, # The router handles fallback, so fail fast
+        groq_api_key=os.getenv("GROQ_API_KEY")
+    )
 
-llm_roadmap = ChatGroq(
-    model="qwen/qwen3-32b", # High quality for complex structured output
-    temperature=0.3, # Lower temperature for consistency
-    groq_api_key=os.getenv("GROQ_API_KEY")
+# Cheap tasks (classification, phrasing) go to small fast models, the roadmap to a large one.
+# model_routing.yaml holds the per-task model lists and fallback thresholds; it is the only
+# source of routing config, and a missing file (including a bad RAAH_MODEL_ROUTING) is an error.
+ROUTING_CONFIG_PATH = os.getenv(
+    "RAAH_MODEL_ROUTING",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_routing.yaml")
 )
+# RAAH_LLM_MODE=record|replay swaps the Groq clients for cassette-backed ones (see llm_cassette.py)
+router = ModelRouter.from_yaml(ROUTING_CONFIG_PATH, cassette_client_factory(create_groq_client))
 
 # Field definitions
 BASIC_FIELDS = ["name", "location", "age", "role"]
 STUDENT_FIELDS = ["student_type", "field_of_study"]
 COMMON_FIELDS = ["skill_to_learn", "skill_level", "goal", "daily_commitment", "estimated_time", "learning_budget"]
+# Canonical order for serializing user_context, independent of the intake path
+CONTEXT_FIELD_ORDER = BASIC_FIELDS + STUDENT_FIELDS + COMMON_FIELDS
 
 # Mapping of fields to user-friendly names for prompting
 FIELD_LABELS = {
@@ -74,12 +88,9 @@ def get_next_field(user_context):
             
     return None
 
-def generate_next_question(chat_history, user_context):
-    field = get_next_field(user_context)
-    if not field:
-        return None, None
-
-    system_msg = SystemMessage(content="""
+# System prompts are constants so every call of a task shares a cacheable prefix.
+# Variable content goes in the user message, most stable sections first.
+QUESTION_SYSTEM_PROMPT = """
 You are RAAH AI, a professional career coach.
 Your goal is to collect information from the user to build a personalized roadmap.
 Ask ONLY ONE clear, friendly question at a time.
@@ -88,44 +99,19 @@ If there is no conversation history, then start with a friendly opening like:
 Don't say Hi or Hello or any greeting after this friendly opening. Just use Hi in the friendly opening.
 Don't use the user name in the response after the first message.
 When you are at the last question, tell the user that after they answer this question, you will generate the roadmap.
-""")
-    
-    user_msg = HumanMessage(content=f"""Conversation history:
-{format_chat_history(chat_history)}
-
-The next piece of information needed is: {FIELD_LABELS.get(field, field)}.
-Ask the user for this information.""")
-
-    response = llm_chat.invoke([system_msg, user_msg])
-    question = postprocess_llm_response(response.content)
-    return field, question
+"""
 
-def is_skill_vague(skill_to_learn):
-    system_msg = SystemMessage(content="""You are an expert skill analyzer. 
+SKILL_CLASSIFIER_PROMPT = """You are an expert skill analyzer. 
 Analyze if the provided skill is too vague to create a specific 3-month roadmap.
 Vague examples: 'Coding', 'Business', 'AI', 'Software Engineering'.
 Specific examples: 'Python for Data Science', 'React Frontend Development', 'Digital Marketing for E-commerce', 'LLM Fine-tuning'.
 
-Output only 'VAGUE' or 'SPECIFIC'.""")
-    
-    user_msg = HumanMessage(content=f"Skill: {skill_to_learn}")
-    
-    response = llm_chat.invoke([system_msg, user_msg])
-    result = postprocess_llm_response(response.content).upper()
-    return "VAGUE" in result
+Output only 'VAGUE' or 'SPECIFIC'."""
 
-def get_clarification_question(skill_to_learn):
-    system_msg = SystemMessage(content="""You are RAAH AI. The user provided a vague skill. 
-Ask them to be more specific and provide 2-3 concrete examples of what they could mean (e.g., if they said 'Coding', suggest 'Web Development with JavaScript' or 'Data Analysis with Python').""")
-    
-    user_msg = HumanMessage(content=f"User's vague skill: {skill_to_learn}")
-    
-    response = llm_chat.invoke([system_msg, user_msg])
-    return postprocess_llm_response(response.content)
+CLARIFICATION_SYSTEM_PROMPT = """You are RAAH AI. The user provided a vague skill. 
+Ask them to be more specific and provide 2-3 concrete examples of what they could mean (e.g., if they said 'Coding', suggest 'Web Development with JavaScript' or 'Data Analysis with Python')."""
 
-def generate_user_profile_summary(user_context):
-    """Generates a concise summary of the user profile based on collected context in semantic HTML."""
-    system_msg = SystemMessage(content="""You are a professional assistant. 
+SUMMARY_SYSTEM_PROMPT = """You are a professional assistant. 
 Summarize the user's provided context into clean, semantic HTML. 
 If answers are long, extract only the core information.
 Use only: <ul>, <li>, <strong>, <p>.
@@ -135,17 +121,9 @@ Format like:
   <li><strong>Name:</strong> [Name]</li>
   <li><strong>Role:</strong> [Role]</li>
   ...
-</ul>""")
-    
-    context_str = "\n".join([f"{k}: {v}" for k, v in user_context.items()])
-    user_msg = HumanMessage(content=f"User Context:\n{context_str}")
-    
-    response = llm_chat.invoke([system_msg, user_msg])
-    return postprocess_llm_response(response.content)
+</ul>"""
 
-def generate_roadmap(user_context):
-    """Generates a detailed learning roadmap in semantic HTML."""
-    system_msg = SystemMessage(content="""You are RAAH AI, a world-class career strategist.
+ROADMAP_SYSTEM_PROMPT = """You are RAAH AI, a world-class career strategist.
 Generate roadmap HTML ONLY. Follow this EXACT structure:
 
 1. Executive Summary
@@ -160,14 +138,245 @@ Output MUST be semantic HTML:
 - Use <ul><li> for lists
 - Use <p> for paragraphs
 - Include <table> for phase/resource tables exactly as shown below
-Do NOT deviate. Do NOT include CSS.""")
+Do NOT deviate. Do NOT include CSS."""
+
+def _invoke(task, prompt):
+    """Routes a prompt to the task's model and records its token usage."""
+    response = router.invoke(task, prompt.messages())
+    record_usage(task, prompt, response)
+    return response
+
+def generate_next_question(chat_history, user_context):
+    field = get_next_field(user_context)
+    if not field:
+        return None, None
+
+    # History is append-only across turns, so it goes before the field being asked for
+    prompt = Prompt(QUESTION_SYSTEM_PROMPT)
+    prompt.add("history", f"Conversation history:\n{format_chat_history(chat_history)}")
+    prompt.add("field", f"""The next piece of information needed is: {FIELD_LABELS.get(field, field)}.
+Ask the user for this information.""")
+
+    response = _invoke("phrasing", prompt)
+    question = postprocess_llm_response(response.content)
+    return field, question
+
+def is_skill_vague(skill_to_learn):
+    prompt = Prompt(SKILL_CLASSIFIER_PROMPT).add("skill", f"Skill: {skill_to_learn}")
     
-    context_str = "\n".join([f"{k}: {v}" for k, v in user_context.items()])
-    user_msg = HumanMessage(content=f"User Context:\n{context_str}\n\nPlease generate the semantic HTML roadmap now.")
+    response = _invoke("classification", prompt)
+    result = postprocess_llm_response(response.content).upper()
+    return "VAGUE" in result
+
+def get_clarification_question(skill_to_learn):
+    prompt = Prompt(CLARIFICATION_SYSTEM_PROMPT).add("skill", f"User's vague skill: {skill_to_learn}")
+    
+    response = _invoke("phrasing", prompt)
+    return postprocess_llm_response(response.content)
+
+def generate_user_profile_summary(user_context):
+    """Generates a concise summary of the user profile based on collected context in semantic HTML."""
+    prompt = Prompt(SUMMARY_SYSTEM_PROMPT)
+    prompt.add("context", f"User Context:\n{serialize_context(user_context, CONTEXT_FIELD_ORDER)}")
+    
+    response = _invoke("summary", prompt)
+    return postprocess_llm_response(response.content)
+
+def generate_roadmap(user_context):
+    """Generates a detailed learning roadmap in semantic HTML."""
+    prompt = Prompt(ROADMAP_SYSTEM_PROMPT)
+    prompt.add("context", f"User Context:\n{serialize_context(user_context, CONTEXT_FIELD_ORDER)}")
+    prompt.add("instructions", "Please generate the semantic HTML roadmap now.")
     
-    response = llm_roadmap.invoke([system_msg, user_msg])
+    response = _invoke("roadmap", prompt)
     return postprocess_llm_response(response.content)
 
+# Roadmap sections in the order generate_roadmap asks for them
+ROADMAP_SECTIONS = [
+    "Executive Summary",
+    "Learning Phases",
+    "Weekly Breakdown",
+    "Recommended Resources",
+    "Tips and Notes"
+]
+
+# Which roadmap sections need regenerating when a profile field changes
+SECTION_DEPENDENCIES = {
+    "name": ["Executive Summary"],
+    "location": ["Executive Summary", "Recommended Resources"],
+    "age": ["Executive Summary", "Tips and Notes"],
+    "role": ["Executive Summary", "Learning Phases", "Tips and Notes"],
+    "student_type": ["Executive Summary", "Learning Phases"],
+    "field_of_study": ["Executive Summary", "Learning Phases"],
+    "skill_to_learn": list(ROADMAP_SECTIONS),
+    "skill_level": ["Executive Summary", "Learning Phases", "Weekly Breakdown", "Recommended Resources"],
+    "goal": ["Executive Summary", "Learning Phases", "Tips and Notes"],
+    "daily_commitment": ["Learning Phases", "Weekly Breakdown", "Tips and Notes"],
+    "estimated_time": ["Executive Summary", "Learning Phases", "Weekly Breakdown"],
+    "learning_budget": ["Learning Phases", "Recommended Resources"]
+}
+
+def _section_title(heading_html):
+    """Maps an <h2> heading to its canonical ROADMAP_SECTIONS title.
+
+    Only headings that start with a canonical title match (after dropping any
+    numbering, and reading "&" as "and"); any other heading keeps its own text.
+    """
+    text = re.sub(r"<.*?>", "", heading_html).strip()
+    text = re.sub(r"^\d+[.)]\s*", "", text)
+    normalized = re.sub(r"\s+", " ", text.replace("&amp;", "&").replace("&", "and")).lower()
+    for title in ROADMAP_SECTIONS:
+        if normalized.startswith(title.lower()):
+            return title
+    return text
+
+def split_roadmap_sections(roadmap_html):
+    """Splits roadmap HTML at each <h2> into a list of (title, html) pairs.
+
+    Anything before the first <h2> is kept as a section with an empty title.
+    """
+    sections = []
+    parts = re.split(r"(?=<h2[\s>])", roadmap_html)
+    for part in parts:
+        if not part.strip():
+            continue
+        heading = re.match(r"<h2[^>]*>(.*?)</h2>", part, re.DOTALL)
+        sections.append((_section_title(heading.group(1)) if heading else "", part))
+    return sections
+
+def join_roadmap_sections(sections):
+    return "".join(section_html for _, section_html in sections)
+
+def regenerate_roadmap_sections(user_context, sections, field):
+    """Regenerates only the roadmap sections that depend on `field`.
+
+    Returns (sections, changed_titles). Falls back to a full generate_roadmap call
+    if the current roadmap is missing one of the affected sections.
+    """
+    affected = SECTION_DEPENDENCIES.get(field, list(ROADMAP_SECTIONS))
+    present = {title for title, _ in sections}
+    if not all(title in present for title in affected):
+        new_sections = split_roadmap_sections(generate_roadmap(user_context))
+        return new_sections, [title for title, _ in new_sections]
+
+    # Shares the roadmap system prefix so the provider can reuse its cache
+    prompt = Prompt(ROADMAP_SYSTEM_PROMPT)
+    prompt.add("context", f"User Context:\n{serialize_context(user_context, CONTEXT_FIELD_ORDER)}")
+    prompt.add("roadmap", f"Current roadmap:\n{join_roadmap_sections(sections)}")
+    prompt.add("instructions", f"""The user changed one detail of their profile: {FIELD_LABELS.get(field, field)} -> {user_context.get(field)}
+Rewrite ONLY these sections of the current roadmap:
+{chr(10).join(f"- {title}" for title in affected)}
+
+Keep them consistent with the rest of the roadmap and the updated user context.
+Start each section with <h2>Section Title</h2> using exactly the titles above, in that order.
+Output ONLY the rewritten sections.""")
+
+    response = _invoke("roadmap", prompt)
+    rewritten = {}
+    for title, section_html in split_roadmap_sections(postprocess_llm_response(response.content)):
+        if title in affected and title not in rewritten:
+            rewritten[title] = section_html
+    # Replace only the first section with each title, in case the roadmap repeats a heading
+    new_sections, changed = [], []
+    for title, section_html in sections:
+        if title in rewritten:
+            section_html = rewritten.pop(title)
+            changed.append(title)
+        new_sections.append((title, section_html))
+    return new_sections, changed
+
+def update_profile_summary(summary_html, user_context, field):
+    """Updates a single field's <li> in the profile summary HTML without an LLM call.
+
+    If no entry for the field can be found, the summary is regenerated instead,
+    so a stale entry under a different label is never left next to the new one.
+    """
+    value = html.escape(str(user_context.get(field, "")))
+    label = FIELD_LABELS.get(field, field).split("(")[0].strip()
+    candidates = [label, field.replace("_", " ")]
+    for candidate in candidates:
+        pattern = re.compile(
+            r"(<li>\s*<strong>\s*" + re.escape(candidate) + r"[^<]*</strong>).*?(</li>)",
+            re.IGNORECASE | re.DOTALL
+        )
+        if pattern.search(summary_html):
+            return pattern.sub(lambda m: f"{m.group(1)} {value}{m.group(2)}", summary_html, count=1)
+    return generate_user_profile_summary(user_context)
+
+@functools.lru_cache(maxsize=256)
+def parse_html_blocks(html_text):
+    """Parses an HTML fragment into a tuple of (kind, payload) blocks for the PDF.
+
+    Cached per process by the fragment text, so after a single-section edit only
+    the changed roadmap section is parsed again when the PDF is rebuilt.
+    """
+    blocks_out = []
+
+    # ---------- TABLE HANDLING ----------
+    tables = re.findall(r"<table.*?>.*?</table>", html_text, re.DOTALL)
+
+    for table_html in tables:
+        rows = re.findall(r"<tr>(.*?)</tr>", table_html, re.DOTALL)
+        table_data = []
+
+        for row in rows:
+            cells = re.findall(r"<t[hd]>(.*?)</t[hd]>", row, re.DOTALL)
+            clean_cells = tuple(re.sub(r'<.*?>', '', cell).strip() for cell in cells)
+            table_data.append(clean_cells)
+
+        if table_data:
+            blocks_out.append(("table", tuple(table_data)))
+
+    # Remove tables from text so they don't render twice
+    html_text = re.sub(r"<table.*?>.*?</table>", "", html_text, flags=re.DOTALL)
+
+    # ---------- NORMAL BLOCK PROCESSING ----------
+    blocks = re.split(
+        r'(<h2.*?>|</h2>|<h3.*?>|</h3>|<p.*?>|</p>|<ul.*?>|</ul>|<li>|</li>)',
+        html_text
+    )
+
+    in_list = False
+    list_items = []
+
+    for block in blocks:
+        clean_block = re.sub(r'<.*?>', '', block).strip()
+        if not clean_block:
+            continue
+
+        # Force Section Titles Blue
+        if any(clean_block.startswith(title) for title in ROADMAP_SECTIONS):
+            blocks_out.append(("section", clean_block))
+            continue
+
+        # Handle Lists
+        if "<ul>" in block:
+            in_list = True
+            list_items = []
+            continue
+
+        if "</ul>" in block:
+            if list_items:
+                blocks_out.append(("list", tuple(list_items)))
+            in_list = False
+            continue
+
+        if "<li>" in block:
+            continue
+
+        if "</li>" in block:
+            if in_list:
+                list_items.append(clean_block)
+            continue
+
+        # Everything else normal paragraph
+        if in_list:
+            list_items.append(clean_block)
+        else:
+            blocks_out.append(("para", clean_block))
+
+    return tuple(blocks_out)
+
 def wrap_html(inner_html):
     """Wraps inner HTML with a full document structure and professional CSS for PDF generation."""
     return f"""
@@ -0,0 +1,220 @@
+# llm_cassette.py
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from model_router import PassthroughError
+
+# RAAH_LLM_MODE: "live" (default), "record" or "replay"
+LLM_MODE = os.getenv("RAAH_LLM_MODE", "live").lower()
+CASSETTE_PATH = os.getenv("RAAH_CASSETTE", os.path.join("cassettes", "session.jsonl"))
+# RAAH_REPLAY_LATENCY: "original" sleeps for the recorded latency, "none" returns immediately
+REPLAY_LATENCY = os.getenv("RAAH_REPLAY_LATENCY", "none").lower()
+
+
+class CassetteMissError(PassthroughError, LookupError):
+    """Raised in replay mode when a request was never recorded.
+
+    Passes straight through the router, since a miss isn't a model failure.
+    """
+
+    def __init__(self, model, key, path):
+        super().__init__(model, key, path)
+        self.model = model
+        self.key = key
+        self.path = path
+
+    def __str__(self):
+        task = f"task '{self.task}', " if self.task else ""
+        return (f"No recorded response for {task}model '{self.model}' "
+                f"(request {self.key[:12]}) in cassette {self.path}")
+
+
+class ReplayedError(RuntimeError):
+    """Re-raises an error that the live model raised while recording."""
+
+
+class CassetteMessage:
+    """Stand-in for a LangChain AIMessage served from a cassette."""
+
+    def __init__(self, content, usage_metadata=None, response_metadata=None):
+        self.content = content
+        self.usage_metadata = usage_metadata
+        self.response_metadata = response_metadata or {}
+
+
+def serialize_messages(messages):
+    """Turns chat messages into plain [{"role", "content"}] dicts."""
+    return [
+        {"role": getattr(m, "type", type(m).__name__), "content": getattr(m, "content", str(m))}
+        for m in messages
+    ]
+
+
+def request_key(task, messages):
+    """Stable hash of the routing task and serialized messages.
+
+    The model is left out on purpose: which model gets asked first depends on
+    the router's live health stats, so it isn't part of the request.
+    """
+    payload = json.dumps(
+        {"task": task, "messages": serialize_messages(messages)},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """A JSONL file of recorded interactions, one JSON object per line.
+
+    Every attempt at a request (including failed ones the router fell back
+    from) is replayed in the order it was recorded, whichever model asks for
+    it; once exhausted, the last recording keeps being served.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> [entry, ...]
+        self._cursors = {}  # key -> next index to serve
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+
+    def append(self, entry):
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._entries.setdefault(entry["key"], []).append(entry)
+
+    def next_entry(self, key, model=None):
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(model, key, self.path)
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def rewind(self):
+        with self._lock:
+            self._cursors.clear()
+
+    def entries(self):
+        with self._lock:
+            return [entry for entries in self._entries.values() for entry in entries]
+
+
+class RecordingChatModel:
+    """Wraps a live chat model and appends every request/response to a cassette."""
+
+    def __init__(self, inner, model, task, cassette):
+        self.inner = inner
+        self.model = model
+        self.task = task
+        self.cassette = cassette
+
+    def invoke(self, messages):
+        entry = {
+            "key": request_key(self.task, messages),
+            "task": self.task,
+            "model": self.model,
+            "messages": serialize_messages(messages),
+        }
+        start = time.perf_counter()
+        try:
+            response = self.inner.invoke(messages)
+        except Exception as e:
+            entry.update(error=f"{type(e).__name__}: {e}", latency=time.perf_counter() - start)
+            self.cassette.append(entry)
+            raise
+        entry.update(
+            content=response.content,
+            usage=getattr(response, "usage_metadata", None),
+            latency=time.perf_counter() - start,
+            recorded_at=time.time()
+        )
+        self.cassette.append(entry)
+        return response
+
+
+class ReplayChatModel:
+    """Serves recorded responses for one task, optionally with the recorded latency.
+
+    The next recorded attempt is served even if another model made it, so a
+    replay doesn't depend on the router trying models in the recorded order.
+    """
+
+    def __init__(self, model, task, cassette, latency="none"):
+        self.model = model
+        self.task = task
+        self.cassette = cassette
+        self.latency = latency
+
+    def invoke(self, messages):
+        entry = self.cassette.next_entry(request_key(self.task, messages), self.model)
+        if self.latency == "original":
+            time.sleep(entry.get("latency", 0.0))
+        if "error" in entry:
+            raise ReplayedError(entry["error"])
+        return CassetteMessage(entry["content"], usage_metadata=entry.get("usage"))
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+def get_cassette(path):
+    """Returns the process-wide Cassette for `path`, loading it on first use."""
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+def cassette_client_factory(live_factory, mode=None, path=None, latency=None):
+    """Wraps a router client factory according to the record/replay mode.
+
+    In replay mode `live_factory` is never called, so no API key or network is needed.
+    """
+    mode = (mode or LLM_MODE).lower()
+    if mode == "live":
+        return live_factory
+    cassette = get_cassette(path or CASSETTE_PATH)
+    if mode == "record":
+        return lambda model, profile: RecordingChatModel(
+            live_factory(model, profile), model, profile.name, cassette
+        )
+    if mode == "replay":
+        return lambda model, profile: ReplayChatModel(
+            model, profile.name, cassette, latency or REPLAY_LATENCY
+        )
+    raise ValueError(f"Unknown RAAH_LLM_MODE '{mode}' (expected live, record or replay)")
+
+def summarize_cassette(path):
+    """Returns per-model call counts, error counts and latency totals for a cassette."""
+    summary = {}
+    for entry in Cassette(path).entries():
+        stats = summary.setdefault(entry["model"], {"calls": 0, "errors": 0, "latency": 0.0})
+        stats["calls"] += 1
+        stats["errors"] += "error" in entry
+        stats["latency"] += entry.get("latency", 0.0)
+    return summary
+
+
+if __name__ == "__main__":
+    # Usage: python llm_cassette.py <cassette.jsonl>
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python llm_cassette.py <cassette.jsonl>")
+    for model, stats in summarize_cassette(sys.argv[1]).items():
+        avg = stats["latency"] / stats["calls"] if stats["calls"] else 0.0
+        print(f"{model}: {stats['calls']} calls, {stats['errors']} errors, "
+              f"{stats['latency']:.2f}s total, {avg:.2f}s avg")
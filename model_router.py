@@ -0,0 +1,161 @@
+# model_router.py
+import os
+import threading
+import time
+from collections import deque
+
+import yaml
+
+
+class PassthroughError(Exception):
+    """An error that says nothing about a model's health.
+
+    The router re-raises it immediately, tagged with the task, instead of
+    counting a failure and falling back to the next model.
+    """
+    task = None
+
+
+class TaskProfile:
+    """Routing rules for one kind of backend call."""
+
+    def __init__(self, name, models, temperature=0.7, max_latency=10.0,
+                 max_error_rate=0.3, timeout=60):
+        if not models:
+            raise ValueError(f"Task profile '{name}' needs at least one model")
+        self.name = name
+        self.models = list(models)
+        self.temperature = temperature
+        self.max_latency = max_latency
+        self.max_error_rate = max_error_rate
+        self.timeout = timeout
+
+
+class ModelStats:
+    """Rolling latency and error rate over the last `window` calls to one model for one task."""
+
+    def __init__(self, window=20):
+        self._calls = deque(maxlen=window)  # (latency_seconds, ok)
+        self.last_attempt = 0.0
+
+    def record(self, latency, ok):
+        self._calls.append((latency, ok))
+        self.last_attempt = time.monotonic()
+
+    @property
+    def count(self):
+        return len(self._calls)
+
+    @property
+    def avg_latency(self):
+        latencies = [lat for lat, ok in self._calls if ok]
+        return sum(latencies) / len(latencies) if latencies else 0.0
+
+    @property
+    def error_rate(self):
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok in self._calls if not ok) / len(self._calls)
+
+    def is_degraded(self, profile):
+        return self.error_rate > profile.max_error_rate or self.avg_latency > profile.max_latency
+
+
+class ModelRouter:
+    """Sends each task to the first healthy model in its profile, falling back on errors.
+
+    `client_factory(model, profile)` must return an object with an
+    `invoke(messages)` method (e.g. a LangChain chat model). Models whose
+    rolling latency or error rate breaches the profile are moved behind the
+    healthy ones, and are only retried first again after `cooldown` seconds.
+    Stats are kept per (task, model), so a model that is slow on long roadmap
+    calls isn't judged against the summary task's latency limit.
+    """
+
+    def __init__(self, profiles, client_factory, window=20, cooldown=60):
+        self.profiles = {p.name: p for p in profiles}
+        self.client_factory = client_factory
+        self.window = window
+        self.cooldown = cooldown
+        self._clients = {}
+        self._stats = {}  # (task, model) -> ModelStats
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, client_factory):
+        defaults = config.get("defaults", {})
+        profiles = [TaskProfile(name, **spec) for name, spec in config.get("tasks", {}).items()]
+        return cls(
+            profiles,
+            client_factory,
+            window=defaults.get("window", 20),
+            cooldown=defaults.get("cooldown", 60),
+        )
+
+    @classmethod
+    def from_yaml(cls, path, client_factory):
+        """Loads the router from a routing YAML file (see model_routing.yaml)."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model routing config not found: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_config(yaml.safe_load(f) or {}, client_factory)
+
+    def _get_stats(self, task, model):
+        key = (task, model)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = ModelStats(self.window)
+            return self._stats[key]
+
+    def _get_client(self, model, profile):
+        key = (model, profile.name)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = self.client_factory(model, profile)
+            return self._clients[key]
+
+    def candidates(self, task):
+        """Returns the task's models in the order they will be tried."""
+        profile = self.profiles[task]
+        now = time.monotonic()
+        healthy, degraded = [], []
+        for model in profile.models:
+            stats = self._get_stats(task, model)
+            cooling = now - stats.last_attempt < self.cooldown
+            (degraded if stats.is_degraded(profile) and cooling else healthy).append(model)
+        return healthy + degraded
+
+    def invoke(self, task, messages):
+        if task not in self.profiles:
+            raise KeyError(f"No routing profile for task '{task}'")
+        profile = self.profiles[task]
+        last_error = None
+        for model in self.candidates(task):
+            stats = self._get_stats(task, model)
+            start = time.perf_counter()
+            try:
+                response = self._get_client(model, profile).invoke(messages)
+            except PassthroughError as e:
+                e.task = task
+                raise
+            except Exception as e:
+                with self._lock:
+                    stats.record(time.perf_counter() - start, ok=False)
+                last_error = e
+                continue
+            with self._lock:
+                stats.record(time.perf_counter() - start, ok=True)
+            return response
+        raise last_error
+
+    def stats(self):
+        """Returns {task: {model: {"calls", "avg_latency", "error_rate"}}} for every pair used so far."""
+        with self._lock:
+            result = {}
+            for (task, model), s in self._stats.items():
+                result.setdefault(task, {})[model] = {
+                    "calls": s.count,
+                    "avg_latency": round(s.avg_latency, 3),
+                    "error_rate": round(s.error_rate, 3),
+                }
+            return result
@@ -0,0 +1,117 @@
+# prompt_builder.py
+import contextlib
+import contextvars
+import re
+import threading
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+# Rough BPE approximation: words split into chunks of up to 4 characters, plus punctuation
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def count_tokens(text):
+    """Approximate token count of `text`, without needing the provider's tokenizer."""
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def serialize_context(user_context, field_order):
+    """Serializes the user context as "key: value" lines in a canonical order.
+
+    Fields in `field_order` come first in that order; any others follow
+    alphabetically, so the same answers always produce the same text no matter
+    which intake path (student or not) filled them in.
+    """
+    ordered = [f for f in field_order if f in user_context]
+    ordered += sorted(f for f in user_context if f not in field_order)
+    return "\n".join(f"{k}: {user_context[k]}" for k in ordered)
+
+
+class Prompt:
+    """A system prefix plus named user-message sections, assembled in a fixed order.
+
+    The system prefix should be a constant so providers can cache it. Add
+    sections from most stable to most variable, so consecutive calls share as
+    long a prefix as possible.
+    """
+
+    def __init__(self, system_prefix):
+        self.system_prefix = system_prefix
+        self.sections = []  # [(name, text)]
+
+    def add(self, name, text):
+        self.sections.append((name, text))
+        return self
+
+    def user_content(self):
+        return "\n\n".join(text for _, text in self.sections)
+
+    def messages(self):
+        return [SystemMessage(content=self.system_prefix), HumanMessage(content=self.user_content())]
+
+    def section_tokens(self):
+        """Returns {section_name: approximate tokens}, with the system prefix under "system"."""
+        tokens = {"system": count_tokens(self.system_prefix)}
+        for name, text in self.sections:
+            tokens[name] = tokens.get(name, 0) + count_tokens(text)
+        return tokens
+
+
+class TokenLedger:
+    """Per-session prompt/completion token totals, broken down by task and prompt section.
+
+    Provider-reported usage (LangChain `usage_metadata`) is used when present;
+    otherwise tokens are estimated with `count_tokens`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tasks = {}  # task -> {"calls", "prompt_tokens", "completion_tokens", "cached_tokens", "sections"}
+
+    def record(self, task, prompt, response):
+        sections = prompt.section_tokens()
+        usage = getattr(response, "usage_metadata", None) or {}
+        prompt_tokens = usage.get("input_tokens") or sum(sections.values())
+        completion_tokens = usage.get("output_tokens") or count_tokens(getattr(response, "content", ""))
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        with self._lock:
+            stats = self.tasks.setdefault(task, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "sections": {}
+            })
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cached_tokens"] += cached_tokens
+            for name, tokens in sections.items():
+                stats["sections"][name] = stats["sections"].get(name, 0) + tokens
+
+    def totals(self):
+        with self._lock:
+            return {
+                key: sum(stats[key] for stats in self.tasks.values())
+                for key in ("calls", "prompt_tokens", "completion_tokens", "cached_tokens")
+            }
+
+
+_current_ledger = contextvars.ContextVar("raah_token_ledger", default=None)
+
+
+def activate_ledger(ledger):
+    """Makes `ledger` receive usage from backend calls in the current context (e.g. a Streamlit rerun)."""
+    _current_ledger.set(ledger)
+
+
+@contextlib.contextmanager
+def use_ledger(ledger):
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current_ledger.reset(token)
+
+
+def record_usage(task, prompt, response):
+    """Adds a call's usage to the active ledger, if any."""
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.record(task, prompt, response)
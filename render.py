@@ -0,0 +1,209 @@
+# render.py
+import base64
+import functools
+import os
+import sys
+import time
+from collections import deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from prompt_builder import TokenLedger, activate_ledger, use_ledger
+
+STATIC_DIR = "static"
+# Where Streamlit serves <main script dir>/static when server.enableStaticServing is on
+# (see .streamlit/config.toml)
+STATIC_URL_PREFIX = "app/static"
+
+# ---------------- STATIC CSS ----------------
+SIDEBAR_CSS = """
+<style>
+/* Sidebar background (optional, light gray to not clash) */
+[data-testid="stSidebar"] {
+    background-color: #1e1e1e;
+}
+
+/* Sidebar title "RAAH AI 🚀" color */
+[data-testid="stSidebar"] .css-1d391kg h1,
+[data-testid="stSidebar"] .css-1d391kg h2 {
+    background: linear-gradient(90deg, #008080, #00FFFF, #4B0082);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+}
+
+/* "Your Progress" labels color */
+[data-testid="stSidebar"] .css-1d391kg p,
+[data-testid="stSidebar"] .css-1d391kg span {
+    color: #00FFFF;
+}
+
+/* Reset button color persistent */
+[data-testid="stSidebar"] div.stButton > button {
+    background-color: transparent !important;
+    border: 2px solid #4B0082 !important;
+    color: #00FFFF !important;
+    padding: 10px 20px !important;
+    font-weight: bold !important;
+    border-radius: 10px !important;
+    transition: 0.3s !important;
+}
+
+[data-testid="stSidebar"] div.stButton > button:hover {
+    transform: scale(1.03);
+    border-color: #00FFFF !important;
+}
+</style>
+"""
+
+LANDING_BUTTON_CSS = """
+<style>
+    div.stButton > button {
+        background-color: transparent !important;
+        border: 2px solid #4B0082 !important;
+        color: #00FFFF !important;
+        padding: 12px 35px !important;
+        font-weight: bold !important;
+        font-size: 1.1rem !important;
+        border-radius: 10px !important;
+        transition: 0.3s !important;
+        margin-top: 20px !important;
+    }
+    div.stButton > button:hover {
+        transform: scale(1.03);
+        border-color: #00FFFF !important;
+    }
+</style>
+"""
+
+DOWNLOAD_BUTTON_CSS = """
+<style>
+div.stDownloadButton > button {
+    background-color: transparent !important;
+    border: 2px solid #4B0082 !important;
+    color: #00FFFF !important;
+    padding: 12px 35px !important;
+    font-weight: bold !important;
+    font-size: 1.1rem !important;
+    border-radius: 10px !important;
+    transition: 0.3s !important;
+}
+div.stDownloadButton > button:hover {
+    transform: scale(1.03);
+    border-color: #00FFFF !important;
+}
+</style>
+"""
+
+# ---------------- STATIC ASSETS ----------------
+def served_static_dir():
+    """The directory Streamlit serves as app/static: static/ next to the main script, not the cwd."""
+    ctx = get_script_run_ctx()
+    main_script = ctx.main_script_path if ctx is not None else sys.modules["__main__"].__file__
+    return os.path.join(os.path.dirname(os.path.abspath(main_script)), STATIC_DIR)
+
+@st.cache_resource
+def image_src(filename):
+    """Returns an <img> src for a file in static/, computed once per process.
+
+    Uses the static file URL when static serving is enabled and the file is
+    in the served directory, so the browser fetches and caches the image
+    once. Otherwise falls back to a base64 data URI, also reading static/
+    under the working directory. Returns None if the file is missing.
+    """
+    served_path = os.path.join(served_static_dir(), filename)
+    if os.path.exists(served_path) and st.get_option("server.enableStaticServing"):
+        return f"{STATIC_URL_PREFIX}/{filename}"
+    path = next(
+        (p for p in (served_path, os.path.join(STATIC_DIR, filename)) if os.path.exists(p)),
+        None
+    )
+    if path is None:
+        return None
+    ext = os.path.splitext(filename)[1].lstrip(".").lower()
+    mime = "image/jpeg" if ext in ("jpg", "jpeg") else f"image/{ext}"
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+# ---------------- RERUN METERING ----------------
+class RenderMeter:
+    """HTML/markdown bytes and server time for each app or fragment run.
+
+    Only payloads passed through render_html / render_markdown are counted,
+    which covers the large HTML blocks, CSS and chat text. Other elements
+    (dividers, widgets, st.write, the PDF behind the download button) are not,
+    so this is not the total sent over the websocket.
+    """
+
+    def __init__(self, history=20):
+        self.runs = deque(maxlen=history)  # {"scope", "html_bytes", "ms"}
+        self.current = None
+
+    def start(self, scope):
+        self.current = {"scope": scope, "html_bytes": 0, "start": time.perf_counter()}
+
+    def add(self, nbytes):
+        if self.current is not None:
+            self.current["html_bytes"] += nbytes
+
+    def finish(self):
+        if self.current is None:
+            return
+        run = self.current
+        self.current = None
+        self.runs.append({
+            "scope": run["scope"],
+            "html_bytes": run["html_bytes"],
+            "ms": round((time.perf_counter() - run["start"]) * 1000, 1)
+        })
+
+def get_meter():
+    if "render_meter" not in st.session_state:
+        st.session_state.render_meter = RenderMeter()
+    return st.session_state.render_meter
+
+def render_html(markup, target=st):
+    """st.markdown with unsafe HTML, counted by the meter."""
+    get_meter().add(len(markup.encode("utf-8")))
+    return target.markdown(markup, unsafe_allow_html=True)
+
+def render_markdown(text, target=st):
+    get_meter().add(len(text.encode("utf-8")))
+    return target.markdown(text)
+
+def activate_session_ledger():
+    """Creates the session's TokenLedger if needed and makes backend calls in this run report to it.
+
+    Lives here rather than in app.py so the ledger is set on the same
+    prompt_builder module that backend.py records usage through.
+    """
+    if "token_ledger" not in st.session_state:
+        st.session_state.token_ledger = TokenLedger()
+    activate_ledger(st.session_state.token_ledger)
+
+def metered_fragment(scope):
+    """Wraps a function as an st.fragment that is metered on its own when it reruns alone.
+
+    A fragment-only rerun runs on a fresh script thread without the top of
+    app.py, so the session's token ledger is activated here as well.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            meter = get_meter()
+            owns_run = meter.current is None # None means a fragment-only rerun
+            if owns_run:
+                meter.start(scope)
+            try:
+                with use_ledger(st.session_state.get("token_ledger")):
+                    return func(*args, **kwargs)
+            finally:
+                if owns_run:
+                    meter.finish()
+        return st.fragment(run)
+    return decorator
+
+def rerun(scope="app"):
+    """Closes the current meter record, then reruns the app or just the calling fragment."""
+    get_meter().finish()
+    st.rerun(scope=scope)
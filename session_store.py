@@ -0,0 +1,188 @@
+# session_store.py
+import hashlib
+import threading
+import time
+import zlib
+
+# Texts shorter than this are kept as plain UTF-8; zlib overhead isn't worth it
+COMPRESS_THRESHOLD = 1024
+
+# Sessions untouched for this long lose their shared artifacts (seconds)
+DEFAULT_IDLE_TTL = 30 * 60
+# Minimum gap between two reaper sweeps (seconds)
+DEFAULT_REAP_INTERVAL = 60
+
+
+class ChatMessage:
+    """A single chat turn. Slotted so long histories don't carry a dict per message."""
+    __slots__ = ("role", "content")
+
+    def __init__(self, role, content):
+        self.role = role
+        self.content = content
+
+    # Dict-style access so existing `msg["role"]` / `msg.get("role")` callers keep working
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self):
+        return {"role": self.role, "content": self.content}
+
+    def nbytes(self):
+        return len(self.role.encode()) + len(self.content.encode())
+
+
+class CompressedText:
+    """Holds a (possibly large) text zlib-compressed, decompressing on access."""
+    __slots__ = ("_blob", "_compressed", "raw_size")
+
+    def __init__(self, text=""):
+        raw = (text or "").encode("utf-8")
+        self.raw_size = len(raw)
+        self._compressed = self.raw_size >= COMPRESS_THRESHOLD
+        self._blob = zlib.compress(raw, 6) if self._compressed else raw
+
+    @property
+    def text(self):
+        raw = zlib.decompress(self._blob) if self._compressed else self._blob
+        return raw.decode("utf-8")
+
+    def nbytes(self):
+        return len(self._blob)
+
+    def __bool__(self):
+        return self.raw_size > 0
+
+    def __str__(self):
+        return self.text
+
+
+class SessionStore:
+    """Process-wide store for large per-session artifacts (e.g. PDFs).
+
+    Sessions keep only a reference (the session id and artifact name); the bytes
+    live here once. Sessions report their footprint on every rerun via `touch`,
+    and sessions idle for longer than `idle_ttl` are evicted by `reap`.
+    """
+
+    def __init__(self, idle_ttl=DEFAULT_IDLE_TTL, reap_interval=DEFAULT_REAP_INTERVAL):
+        self.idle_ttl = idle_ttl
+        self.reap_interval = reap_interval
+        self._lock = threading.Lock()
+        self._artifacts = {}   # session_id -> {name: (digest, bytes)}
+        self._last_seen = {}   # session_id -> monotonic timestamp
+        self._state_bytes = {} # session_id -> last reported session_state bytes
+        self._last_reap = time.monotonic()
+
+    def touch(self, session_id, state_bytes=0, now=None):
+        """Marks a session as active, records its state size, and reaps idle sessions."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_seen[session_id] = now
+            self._state_bytes[session_id] = state_bytes
+        if now - self._last_reap >= self.reap_interval:
+            self.reap(now)
+
+    def put_artifact(self, session_id, name, data):
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            self._artifacts.setdefault(session_id, {})[name] = (digest, data)
+            self._last_seen.setdefault(session_id, time.monotonic())
+        return digest
+
+    def get_artifact(self, session_id, name, digest):
+        """Returns the stored bytes, or None if missing or not matching `digest`.
+
+        A `digest` of None means the caller's copy is stale (e.g. the roadmap
+        was edited), so it never matches.
+        """
+        if digest is None:
+            return None
+        with self._lock:
+            entry = self._artifacts.get(session_id, {}).get(name)
+        if entry is None or entry[0] != digest:
+            return None
+        return entry[1]
+
+    def drop_session(self, session_id):
+        with self._lock:
+            self._artifacts.pop(session_id, None)
+            self._last_seen.pop(session_id, None)
+            self._state_bytes.pop(session_id, None)
+
+    def reap(self, now=None):
+        """Evicts every session idle for longer than `idle_ttl`. Returns the evicted ids."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_reap = now
+            idle = [sid for sid, seen in self._last_seen.items() if now - seen > self.idle_ttl]
+        for sid in idle:
+            self.drop_session(sid)
+        return idle
+
+    def artifact_bytes(self, session_id):
+        with self._lock:
+            return sum(len(data) for _, data in self._artifacts.get(session_id, {}).values())
+
+    def usage(self):
+        """Returns {session_id: {"state": bytes, "artifacts": bytes}} for all live sessions."""
+        with self._lock:
+            sids = list(self._last_seen)
+        return {
+            sid: {"state": self._state_bytes.get(sid, 0), "artifacts": self.artifact_bytes(sid)}
+            for sid in sids
+        }
+
+    def total_bytes(self):
+        return sum(u["state"] + u["artifacts"] for u in self.usage().values())
+
+
+def _payload_bytes(value, expanded):
+    """Approximate payload size of a session_state value.
+
+    With `expanded=True` the value is measured as the plain, uncompressed
+    representation (dict messages, full strings) it replaces.
+    """
+    if isinstance(value, CompressedText):
+        return value.raw_size if expanded else value.nbytes()
+    if isinstance(value, ChatMessage):
+        # A {"role": ..., "content": ...} dict also stores its two key strings
+        return value.nbytes() + (len("role") + len("content") if expanded else 0)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(k)) + _payload_bytes(v, expanded) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_bytes(v, expanded) for v in value)
+    return 8
+
+
+def session_memory_report(state, artifact_bytes=0):
+    """Reports approximate bytes used by a session before and after compaction.
+
+    "before" is what the session would hold in the old layout: plain dict
+    messages, uncompressed HTML, and the PDF kept inline both as bytes and as
+    its base64 string. "after" is what it holds now, with the PDF counted
+    once in the shared store.
+    """
+    before = after = 0
+    per_key = {}
+    for key, value in state.items():
+        raw = _payload_bytes(value, expanded=True)
+        compact = _payload_bytes(value, expanded=False)
+        per_key[key] = {"before": raw, "after": compact}
+        before += raw
+        after += compact
+    # Inline PDF bytes plus a base64 copy (4/3 the size) per session
+    before += artifact_bytes + (artifact_bytes + 2) // 3 * 4
+    after += artifact_bytes
+    return {"before": before, "after": after, "keys": per_key}
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from model_router import ModelRouter, TaskProfile
+
+
+class FakeClient:
+    def __init__(self, model, fail=False):
+        self.model = model
+        self.fail = fail
+
+    def invoke(self, messages):
+        if self.fail:
+            raise RuntimeError(f"{self.model} is down")
+        return self.model
+
+
+def make_router(failing=()):
+    profiles = [
+        TaskProfile("summary", ["big", "small"], max_latency=8.0),
+        TaskProfile("roadmap", ["qwen", "big"], max_latency=45.0),
+    ]
+    return ModelRouter(profiles, lambda model, profile: FakeClient(model, model in failing))
+
+
+def test_falls_back_when_primary_fails():
+    router = make_router(failing={"qwen"})
+    assert router.invoke("roadmap", []) == "big"
+    assert router.candidates("roadmap") == ["big", "qwen"]
+    assert router.stats()["roadmap"]["qwen"]["error_rate"] == 1.0
+
+
+def test_latency_is_judged_per_task():
+    router = make_router()
+    # A slow roadmap fallback on "big" is fine for the roadmap task...
+    router._get_stats("roadmap", "big").record(30.0, ok=True)
+    # ...and must not push summary calls off "big"
+    assert router.candidates("summary") == ["big", "small"]
+
+    router._get_stats("summary", "big").record(30.0, ok=True)
+    assert router.candidates("summary") == ["small", "big"]
+
+
+def test_missing_config_is_an_error():
+    with pytest.raises(FileNotFoundError):
+        ModelRouter.from_yaml("does-not-exist.yaml", None)
+
+
+def test_committed_config_defines_every_task():
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "model_routing.yaml")
+    router = ModelRouter.from_yaml(path, None)
+    assert set(router.profiles) == {"classification", "phrasing", "summary", "roadmap"}
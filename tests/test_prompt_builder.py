@@ -0,0 +1,80 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from prompt_builder import Prompt, TokenLedger, count_tokens, serialize_context
+
+# Same order as backend.CONTEXT_FIELD_ORDER (basic, student, common fields)
+FIELD_ORDER = [
+    "name", "location", "age", "role",
+    "student_type", "field_of_study",
+    "skill_to_learn", "skill_level", "goal", "daily_commitment", "estimated_time", "learning_budget",
+]
+
+ANSWERS = {
+    "name": "Test User",
+    "location": "Lahore",
+    "age": "24",
+    "skill_to_learn": "Python for Data Science",
+    "skill_level": "Beginner",
+    "goal": "Switch to a data analyst role",
+    "daily_commitment": "2 hours",
+    "estimated_time": "3 months",
+    "learning_budget": "Paid",
+}
+
+
+class Response:
+    def __init__(self, content, usage_metadata=None):
+        self.content = content
+        self.usage_metadata = usage_metadata
+
+
+def test_student_and_professional_intakes_serialize_identically():
+    # The student path asks its extra questions between role and skill, and
+    # an edit re-inserts a field at the end; neither may change the order
+    professional = dict(ANSWERS, role="Student")
+    student = {}
+    for field, value in ANSWERS.items():
+        student[field] = value
+        if field == "age":
+            student.update(role="Student", student_type="University", field_of_study="Physics")
+    edited = dict(professional)
+    edited["name"] = edited.pop("name")
+
+    student_text = serialize_context(student, FIELD_ORDER)
+    professional_text = serialize_context(professional, FIELD_ORDER)
+    assert serialize_context(edited, FIELD_ORDER) == professional_text
+
+    student_lines = student_text.splitlines()
+    assert student_lines[4:6] == ["student_type: University", "field_of_study: Physics"]
+    assert student_lines[:4] + student_lines[6:] == professional_text.splitlines()
+
+
+def test_unknown_fields_follow_alphabetically():
+    text = serialize_context({"zeta": "1", "alpha": "2", "name": "N"}, FIELD_ORDER)
+    assert text == "name: N\nalpha: 2\nzeta: 1"
+
+
+def test_ledger_estimates_tokens_without_usage_metadata():
+    prompt = Prompt("You are RAAH AI.").add("context", "Skill: Python").add("task", "Summarize.")
+    ledger = TokenLedger()
+    ledger.record("summary", prompt, Response("<ul><li>Python</li></ul>"))
+
+    stats = ledger.tasks["summary"]
+    assert stats["prompt_tokens"] == sum(prompt.section_tokens().values())
+    assert stats["completion_tokens"] == count_tokens("<ul><li>Python</li></ul>")
+    assert stats["cached_tokens"] == 0
+    assert stats["sections"] == prompt.section_tokens()
+
+
+def test_ledger_prefers_provider_usage():
+    prompt = Prompt("You are RAAH AI.").add("context", "Skill: Python")
+    ledger = TokenLedger()
+    usage = {"input_tokens": 120, "output_tokens": 30, "input_token_details": {"cache_read": 100}}
+    ledger.record("summary", prompt, Response("ok", usage))
+    ledger.record("roadmap", prompt, Response("ok"))
+
+    assert ledger.tasks["summary"]["prompt_tokens"] == 120
+    assert ledger.totals()["calls"] == 2
+    assert ledger.totals()["cached_tokens"] == 100
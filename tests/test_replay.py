@@ -0,0 +1,94 @@
+# Replays tests/cassettes/replay_flow.jsonl through every backend function, offline.
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+pytest.importorskip("langchain_groq")
+
+import backend
+import llm_cassette
+from llm_cassette import CassetteMissError
+from model_router import ModelRouter
+from prompt_builder import TokenLedger, use_ledger
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "cassettes", "replay_flow.jsonl")
+
+CONTEXT = {
+    "name": "Test User",
+    "location": "Lahore",
+    "age": "24",
+    "role": "Professional",
+    "skill_to_learn": "Python for Data Science",
+    "skill_level": "Beginner",
+    "goal": "Switch to a data analyst role",
+    "daily_commitment": "2 hours",
+    "estimated_time": "3 months",
+    "learning_budget": "Paid"
+}
+
+
+@pytest.fixture
+def replay_router(monkeypatch):
+    def live_factory(model, profile):
+        raise AssertionError("replay must not create live clients")
+
+    # Reload the cassette so recorded sequences start from the top in every test
+    monkeypatch.setattr(llm_cassette, "_cassettes", {})
+    router = ModelRouter.from_yaml(
+        backend.ROUTING_CONFIG_PATH,
+        llm_cassette.cassette_client_factory(live_factory, "replay", CASSETTE, "none")
+    )
+    monkeypatch.setattr(backend, "router", router)
+    return router
+
+
+def test_backend_flow_replays_offline(replay_router):
+    ledger = TokenLedger()
+    with use_ledger(ledger):
+        field, question = backend.generate_next_question([], {})
+        assert field == "name"
+        assert question.startswith("Hello! I’m RAAH AI")
+
+        assert backend.is_skill_vague("AI") is True
+        assert backend.is_skill_vague("Python for Data Science") is False
+        assert "Web Development" in backend.get_clarification_question("AI")
+
+        summary = backend.generate_user_profile_summary(CONTEXT)
+        assert "<strong>Learning budget:</strong> Paid" in summary
+
+        roadmap = backend.generate_roadmap(CONTEXT)
+        sections = backend.split_roadmap_sections(roadmap)
+        assert [title for title, _ in sections] == backend.ROADMAP_SECTIONS
+
+        edited = dict(CONTEXT, learning_budget="Free")
+        new_sections, changed = backend.regenerate_roadmap_sections(edited, sections, "learning_budget")
+        assert changed == ["Learning Phases", "Recommended Resources"]
+        assert dict(new_sections)["Weekly Breakdown"] == dict(sections)["Weekly Breakdown"]
+        assert "free resources" in dict(new_sections)["Recommended Resources"]
+
+    # The recorded qwen outage is replayed, so the roadmap fell back to llama
+    stats = replay_router.stats()["roadmap"]
+    assert stats["qwen/qwen3-32b"]["error_rate"] == 1.0
+    assert stats["llama-3.3-70b-versatile"]["calls"] == 2
+    assert ledger.totals()["calls"] == 7
+
+
+def test_unrecorded_request_is_not_a_model_failure(replay_router):
+    with pytest.raises(CassetteMissError) as excinfo:
+        backend.is_skill_vague("Underwater basket weaving")
+    assert excinfo.value.task == "classification"
+    assert "llama-3.1-8b-instant" in str(excinfo.value)
+    assert replay_router.stats()["classification"]["llama-3.1-8b-instant"]["calls"] == 0
+
+
+def test_replay_does_not_depend_on_candidate_order(replay_router):
+    expected = backend.generate_roadmap(CONTEXT)
+
+    llm_cassette.get_cassette(CASSETTE).rewind()
+    # Degrade qwen up front, so the router now tries llama first
+    replay_router._get_stats("roadmap", "qwen/qwen3-32b").record(0.05, ok=False)
+    assert replay_router.candidates("roadmap")[0] == "llama-3.3-70b-versatile"
+
+    assert backend.generate_roadmap(CONTEXT) == expected
@@ -0,0 +1,96 @@
+from session_store import (
+    COMPRESS_THRESHOLD,
+    ChatMessage,
+    CompressedText,
+    SessionStore,
+    session_memory_report
+)
+
+
+def test_compressed_text_round_trips():
+    short = "<p>hi</p>"
+    long = "<h2>Learning Phases</h2><p>Week by week plan.</p>" * 100
+    assert CompressedText(short).text == short
+    assert CompressedText(long).text == long
+    assert len(long) > COMPRESS_THRESHOLD
+    assert CompressedText(long).nbytes() < len(long)
+    assert not CompressedText()
+
+
+def test_chat_message_supports_dict_access():
+    msg = ChatMessage("user", "Rust")
+    assert msg["role"] == "user"
+    assert msg.get("content") == "Rust"
+    assert msg.get("missing", "x") == "x"
+
+
+def test_reap_evicts_only_idle_sessions():
+    store = SessionStore(idle_ttl=100, reap_interval=10)
+    store.touch("old", state_bytes=10, now=0)
+    digest = store.put_artifact("old", "roadmap_pdf", b"%PDF-old")
+    store.touch("new", state_bytes=20, now=150)
+
+    assert store.reap(now=150) == ["old"]
+    assert store.get_artifact("old", "roadmap_pdf", digest) is None
+    assert set(store.usage()) == {"new"}
+
+
+def test_edit_forces_pdf_rebuild():
+    # Mirrors the PDF panel: reuse the stored PDF while the digest matches,
+    # and rebuild once an edit has cleared the digest
+    store = SessionStore()
+    builds = []
+
+    def pdf_for(digest, roadmap):
+        pdf = store.get_artifact("s", "roadmap_pdf", digest)
+        if pdf is None:
+            builds.append(roadmap)
+            pdf = f"%PDF-{roadmap}".encode()
+            digest = store.put_artifact("s", "roadmap_pdf", pdf)
+        return pdf, digest
+
+    pdf, digest = pdf_for(None, "v1")
+    assert pdf_for(digest, "v1") == (pdf, digest)
+    assert builds == ["v1"]
+
+    pdf, digest = pdf_for(None, "v2")  # The edit set pdf_digest to None
+    assert pdf == b"%PDF-v2"
+    assert builds == ["v1", "v2"]
+    assert store.get_artifact("s", "roadmap_pdf", digest) == b"%PDF-v2"
+
+
+def test_touch_reaps_once_interval_has_passed():
+    store = SessionStore(idle_ttl=100, reap_interval=10)
+    store._last_reap = 0
+    store.touch("old", now=0)
+    store.touch("new", now=5)
+    assert "old" in store.usage()  # Within reap_interval: no sweep yet
+    store.touch("new", now=200)
+    assert set(store.usage()) == {"new"}
+
+
+def test_memory_accounting():
+    store = SessionStore()
+    store.touch("s", state_bytes=1000, now=0)
+    store.put_artifact("s", "roadmap_pdf", b"x" * 300)
+    assert store.artifact_bytes("s") == 300
+    assert store.usage() == {"s": {"state": 1000, "artifacts": 300}}
+    assert store.total_bytes() == 1300
+
+
+def test_session_memory_report_before_and_after():
+    roadmap = "<h2>Weekly Breakdown</h2><ul><li>Practice</li></ul>" * 200
+    state = {
+        "chat_history": [ChatMessage("user", "hello")],
+        "roadmap_html": CompressedText(roadmap),
+    }
+    report = session_memory_report(state, artifact_bytes=300)
+
+    assert report["keys"]["roadmap_html"]["before"] == len(roadmap)
+    assert report["keys"]["roadmap_html"]["after"] < len(roadmap)
+    # A dict message also stores its "role"/"content" keys
+    assert report["keys"]["chat_history"]["before"] == len("userhello") + len("rolecontent")
+    # Inline PDF bytes plus a base64 copy before; one shared copy after
+    assert report["before"] == sum(k["before"] for k in report["keys"].values()) + 300 + 400
+    assert report["after"] == sum(k["after"] for k in report["keys"].values()) + 300
+    assert report["after"] < report["before"]